@@ -1,13 +1,22 @@
 import pytest
 
 
-@pytest.fixture
-def env_vars(monkeypatch):
-    monkeypatch.setenv("AWS_S3_ACCESS_KEY_ID", "akid")
-    monkeypatch.setenv("AWS_S3_SECRET_ACCESS_KEY", "secret")
-    monkeypatch.setenv("AWS_S3_REGION_NAME", "eu-west-1")
-    monkeypatch.setenv("GCP_PROJECT_ID", "my-project")
-    monkeypatch.setenv("GCP_CREDENTIALS_FILE", "/home/user/creds.json")
-    monkeypatch.setenv("OCI_CONFIG_FILE", "/home/user/.oci/config")
-    monkeypatch.setenv("AZURE_ACCOUNT_NAME", "acct")
-    monkeypatch.setenv("AZURE_ACCOUNT_KEY", "key123")
+@pytest.fixture(scope="module")
+def monkeymod():
+    """
+    Module scoped counterpart of the builtin ``monkeypatch`` fixture.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+@pytest.fixture(scope="module")
+def env_vars(monkeymod):
+    monkeymod.setenv("AWS_S3_ACCESS_KEY_ID", "akid")
+    monkeymod.setenv("AWS_S3_SECRET_ACCESS_KEY", "secret")
+    monkeymod.setenv("AWS_S3_REGION_NAME", "eu-west-1")
+    monkeymod.setenv("GCP_PROJECT_ID", "my-project")
+    monkeymod.setenv("GCP_CREDENTIALS_FILE", "/home/user/creds.json")
+    monkeymod.setenv("OCI_CONFIG_FILE", "/home/user/.oci/config")
+    monkeymod.setenv("AZURE_ACCOUNT_NAME", "acct")
+    monkeymod.setenv("AZURE_ACCOUNT_KEY", "key123")
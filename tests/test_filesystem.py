@@ -1,21 +1,26 @@
+import dataclasses
 import pathlib
-from unittest.mock import MagicMock, patch
+import threading
+from unittest.mock import Mock, patch
 
 import pytest
 
 from vc_file_upload import exception
 from vc_file_upload.config import (
     STORAGE_BACKEND_AWS,
+    STORAGE_BACKEND_AZURE,
     STORAGE_BACKEND_LOCAL,
+    STORAGE_BACKEND_OCI,
 )
 from vc_file_upload.filesystem import FileSystem
 
 
 @pytest.fixture
 def mock_storage():
-    storage = MagicMock()
-    storage.glob = MagicMock()
-    storage.sign = MagicMock(
+    storage = Mock()
+    storage.find = Mock()
+    storage.walk = Mock()
+    storage.sign = Mock(
         side_effect=lambda p, expiration=86400: f"signed:{p}:{expiration}"
     )
     return storage
@@ -39,62 +44,64 @@ def test_init_validations():
 
 
 @pytest.mark.parametrize(
-    "backend, expected_path_cls",
+    "backend, root_path, expected",
     [
-        (STORAGE_BACKEND_LOCAL, pathlib.PurePath),  # local uses OS default
-        (STORAGE_BACKEND_AWS, pathlib.PurePosixPath),  # non-local + win32 uses posix
+        (STORAGE_BACKEND_LOCAL, "/root/", "/root/sub/file.vcf"),
+        (STORAGE_BACKEND_AWS, "bucket/path/", "bucket/path/sub/file.vcf"),
+        (STORAGE_BACKEND_LOCAL, "file:///root", "/root/sub/file.vcf"),
+        (STORAGE_BACKEND_AWS, "s3://bucket", "bucket/sub/file.vcf"),
     ],
 )
-def test_build_path_handles_backends_and_platform(
-    backend, expected_path_cls, patch_create_storage
+def test_build_path_handles_backends(
+    backend, root_path, expected, patch_create_storage
 ):
-    fs = FileSystem(
-        root_path="C:/root" if backend == STORAGE_BACKEND_AWS else "/root",
-        storage_backend=backend,
-    )
+    fs = FileSystem(root_path=root_path, storage_backend=backend)
 
-    with patch("vc_file_upload.filesystem.sys.platform", "win32"):
-        built = fs._build_path("sub", "file.vcf")
+    assert fs._build_path("sub", "file.vcf") == expected
 
-    expected = str(expected_path_cls(fs.root_path, "sub", "file.vcf"))
-    assert built == expected
 
-
-def test_find_files_success_aggregates_patterns(patch_create_storage, mock_storage):
+def test_find_files_filters_single_listing(patch_create_storage, mock_storage):
     fs = FileSystem(
         root_path="/data",
         accepted_file_extensions={"vcf", "bam"},
         storage_backend=STORAGE_BACKEND_LOCAL,
     )
+    mock_storage.walk.return_value = [
+        ("/data", ["a", "b", "c"], []),
+        ("/data/a", [], ["a.vcf", "a.vcf.gz"]),
+        ("/data/b", [], ["b.vcf"]),
+        ("/data/c", [], ["c.bam", "c.bam.bai", "notes.txt"]),
+    ]
 
-    # Configure glob responses for two patterns (order-independent)
-    def glob_side_effect(arg):
-        if arg.endswith("**/*.vcf"):
-            return ["/data/a/a.vcf", "/data/b/b.vcf"]
-        if arg.endswith("**/*.bam"):
-            return ["/data/c/c.bam"]
-        return []
+    files = fs.find_files()
 
-    mock_storage.glob.side_effect = glob_side_effect
+    assert files == ["/data/a/a.vcf", "/data/b/b.vcf", "/data/c/c.bam"]
+    mock_storage.walk.assert_called_once_with(fs._build_path(), maxdepth=None)
+    mock_storage.glob.assert_not_called()
 
-    files = fs.find_files()
 
-    assert sorted(files) == sorted(["/data/a/a.vcf", "/data/b/b.vcf", "/data/c/c.bam"])
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_lists_bucket_once(mock_storage):
+    fs = FileSystem(
+        root_path="bucket/path",
+        storage_backend=STORAGE_BACKEND_AWS,
+        accepted_file_extensions={"vcf"},
+    )
+    mock_storage.find.return_value = ["bucket/path/a.vcf", "bucket/path/a.txt"]
 
-    called_args = [args[0] for args, _ in mock_storage.glob.call_args_list]
-    assert any(p.endswith("**/*.vcf") for p in called_args)
-    assert any(p.endswith("**/*.bam") for p in called_args)
+    assert fs.find_files() == ["bucket/path/a.vcf"]
+    mock_storage.find.assert_called_once_with(fs._build_path())
 
 
 def test_find_files_wraps_storage_errors(patch_create_storage, mock_storage):
     fs = FileSystem(root_path="/data")
-    mock_storage.glob.side_effect = Exception("boom")
+    mock_storage.walk.side_effect = Exception("boom")
 
     with pytest.raises(exception.StorageException) as ei:
-        fs._find_files_by_pattern("**/*.vcf")
+        fs.find_files()
 
     msg = str(ei.value)
-    assert "Failed to find files matching pattern" in msg
+    assert "Failed to list files under" in msg
     assert "boom" in msg
 
 
@@ -102,25 +109,22 @@ def test_retrieve_files_with_names_none_when_no_files(
     patch_create_storage, mock_storage
 ):
     fs = FileSystem(root_path="/data")
-    mock_storage.glob.return_value = []
+    mock_storage.walk.return_value = [("/data", [], ["notes.txt"])]
 
     result = fs.retrieve_files_with_names()
     assert result is None
 
-    assert mock_storage.glob.called
+    assert mock_storage.walk.called
 
 
 @pytest.mark.usefixtures("patch_create_storage")
 def test_retrieve_files_with_names_local_no_sign(mock_storage):
     fs = FileSystem(root_path="/root", storage_backend=STORAGE_BACKEND_LOCAL)
-    mock_storage.glob.side_effect = lambda pattern: (
-        [
-            "/root/dir1/sample-1.vcf",
-            "/root/dir2/run.bam",
-        ]
-        if pattern.endswith("**/*.vcf")
-        else (["/root/dir2/run.bam"] if pattern.endswith("**/*.bam") else [])
-    )
+    mock_storage.walk.return_value = [
+        ("/root", ["dir1", "dir2"], []),
+        ("/root/dir1", [], ["sample-1.vcf"]),
+        ("/root/dir2", [], ["run.bam"]),
+    ]
 
     result = fs.retrieve_files_with_names()
 
@@ -139,15 +143,7 @@ def test_retrieve_files_with_names_bucket_uses_signed_urls(mock_storage):
         signed_url_expiration=3600,
         accepted_file_extensions={"vcf", "bam"},
     )
-
-    def glob_side_effect(pattern):
-        if pattern.endswith("**/*.vcf"):
-            return ["bucket/path/a.vcf"]
-        if pattern.endswith("**/*.bam"):
-            return ["bucket/path/b.bam"]
-        return []
-
-    mock_storage.glob.side_effect = glob_side_effect
+    mock_storage.find.return_value = ["bucket/path/a.vcf", "bucket/path/b.bam"]
 
     result = fs.retrieve_files_with_names()
 
@@ -158,3 +154,231 @@ def test_retrieve_files_with_names_bucket_uses_signed_urls(mock_storage):
         "signed:bucket/path/a.vcf:3600": "a.vcf",
         "signed:bucket/path/b.bam:3600": "b.bam",
     }
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_iter_files_with_names_is_lazy(mock_storage):
+    fs = FileSystem(
+        root_path="/root",
+        storage_backend=STORAGE_BACKEND_LOCAL,
+        accepted_file_extensions={"vcf"},
+    )
+    mock_storage.walk.return_value = [("/root", [], ["a.vcf", "b.vcf"])]
+
+    files = fs.iter_files_with_names()
+    mock_storage.walk.assert_not_called()
+
+    assert list(files) == [("/root/a.vcf", "a.vcf"), ("/root/b.vcf", "b.vcf")]
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_iter_files_with_names_signs_concurrently_in_order(mock_storage):
+    fs = FileSystem(
+        root_path="bucket",
+        storage_backend=STORAGE_BACKEND_AWS,
+        accepted_file_extensions={"vcf"},
+        max_parallel_signing=4,
+    )
+    files = [f"bucket/{i}.vcf" for i in range(8)]
+    mock_storage.find.return_value = files
+    barrier = threading.Barrier(4, timeout=5)
+
+    def sign(path, expiration):
+        # Only completes if four signing calls run at the same time.
+        barrier.wait()
+        return f"signed:{path}"
+
+    mock_storage.sign.side_effect = sign
+
+    assert list(fs.iter_files_with_names()) == [
+        (f"signed:{file}", pathlib.Path(file).name) for file in files
+    ]
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_lists_wildcard_root_below_its_prefix(mock_storage):
+    fs = FileSystem(
+        root_path="bucket/runs/2024-*",
+        storage_backend=STORAGE_BACKEND_AWS,
+        accepted_file_extensions={"vcf"},
+    )
+    mock_storage.find.return_value = [
+        "bucket/runs/2024-01/a.vcf",
+        "bucket/runs/2024-02/x/b.vcf",
+        "bucket/runs/2023-12/c.vcf",
+    ]
+
+    assert fs.find_files() == [
+        "bucket/runs/2024-01/a.vcf",
+        "bucket/runs/2024-02/x/b.vcf",
+    ]
+    mock_storage.find.assert_called_once_with("bucket/runs", maxdepth=None)
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_filesystem_is_immutable():
+    fs = FileSystem(root_path="/data", accepted_file_extensions={"vcf"})
+
+    assert fs.accepted_file_extensions == frozenset({"vcf"})
+    assert not hasattr(fs, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        fs.root_path = "/other"
+
+
+def test_bucket_signing_requires_oci():
+    with pytest.raises(ValueError):
+        FileSystem(
+            root_path="bucket", storage_backend=STORAGE_BACKEND_AWS, bucket_signing=True
+        )
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_iter_files_with_names_bucket_signing(mock_storage):
+    fs = FileSystem(
+        root_path="bucket@ns",
+        storage_backend=STORAGE_BACKEND_OCI,
+        accepted_file_extensions={"vcf"},
+        signed_url_expiration=3600,
+        bucket_signing=True,
+    )
+    mock_storage.find.return_value = ["bucket@ns/a.vcf", "bucket@ns/a.txt"]
+    mock_storage.sign_many.side_effect = lambda files, expiration: (
+        (file, f"par/{file}") for file in files
+    )
+
+    assert list(fs.iter_files_with_names()) == [("par/bucket@ns/a.vcf", "a.vcf")]
+    mock_storage.sign.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "root_path, listed_path, expected_maxdepth",
+    [
+        ("bucket/runs/2024-*", "bucket/runs", 2),
+        ("bucket/runs/*/lane-?", "bucket/runs", 3),
+        ("bucket/runs/**", "bucket/runs", None),
+    ],
+)
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_non_recursive_limits_depth(
+    mock_storage, root_path, listed_path, expected_maxdepth
+):
+    fs = FileSystem(
+        root_path=root_path,
+        storage_backend=STORAGE_BACKEND_AWS,
+        accepted_file_extensions={"vcf"},
+        recursive=False,
+    )
+    mock_storage.find.return_value = [
+        "bucket/path/a.vcf",
+        "bucket/runs/2024-01/b.vcf",
+        "bucket/runs/2024-01/lane-1/c.vcf",
+        "bucket/runs/2024-01/lane-1/x/d.vcf",
+    ]
+
+    fs.find_files()
+
+    mock_storage.find.assert_called_once_with(listed_path, maxdepth=expected_maxdepth)
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_non_recursive_wildcard_keeps_direct_children(mock_storage):
+    fs = FileSystem(
+        root_path="bucket/runs/2024-*",
+        storage_backend=STORAGE_BACKEND_AWS,
+        accepted_file_extensions={"vcf"},
+        recursive=False,
+    )
+    mock_storage.find.return_value = [
+        "bucket/runs/2024-01/a.vcf",
+        "bucket/runs/2024-01/x/b.vcf",
+    ]
+
+    assert fs.find_files() == ["bucket/runs/2024-01/a.vcf"]
+
+
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_non_recursive_wildcard_when_backend_ignores_maxdepth(
+    mock_storage,
+):
+    fs = FileSystem(
+        root_path="cont/di?",
+        storage_backend=STORAGE_BACKEND_AZURE,
+        accepted_file_extensions={"vcf"},
+        recursive=False,
+    )
+    # Like adlfs, the listing ignores maxdepth and returns the whole subtree.
+    mock_storage.find.side_effect = lambda path, **kwargs: [
+        "cont/dir/a.vcf",
+        "cont/dir/sub/b.vcf",
+        "cont/dir/sub/deep/c.vcf",
+    ]
+
+    assert fs.find_files() == ["cont/dir/a.vcf"]
+
+
+@pytest.mark.parametrize(
+    "root_path, listed_path, entries, expected",
+    [
+        (
+            "abfs://cont/dir/",
+            "cont/dir",
+            [
+                {"name": "cont/dir/a.vcf", "type": "file"},
+                {"name": "cont/dir/b.txt", "type": "file"},
+                {"name": "cont/dir/sub.vcf", "type": "directory"},
+            ],
+            ["cont/dir/a.vcf"],
+        ),
+        # A root naming a single object is listed as that object.
+        (
+            "cont/x.vcf",
+            "cont/x.vcf",
+            [{"name": "cont/x.vcf", "type": "file"}],
+            ["cont/x.vcf"],
+        ),
+    ],
+)
+@pytest.mark.usefixtures("patch_create_storage")
+def test_find_files_non_recursive_bucket_lists_one_level(
+    mock_storage, root_path, listed_path, entries, expected
+):
+    fs = FileSystem(
+        root_path=root_path,
+        storage_backend=STORAGE_BACKEND_AZURE,
+        accepted_file_extensions={"vcf"},
+        recursive=False,
+    )
+    mock_storage.ls.return_value = entries
+
+    assert fs.find_files() == expected
+    mock_storage.ls.assert_called_once_with(listed_path, detail=True)
+    mock_storage.find.assert_not_called()
+
+
+@pytest.mark.parametrize("root_path", ["buck*", "s3://buck?t/path", "[ab]/path"])
+@pytest.mark.usefixtures("patch_create_storage")
+def test_init_rejects_wildcard_in_bucket_name(root_path):
+    with pytest.raises(ValueError, match="bucket name"):
+        FileSystem(root_path=root_path, storage_backend=STORAGE_BACKEND_AWS)
+
+
+@pytest.mark.parametrize("recursive", [True, False])
+def test_find_files_local_wildcard_in_first_component(recursive):
+    fs = FileSystem(
+        root_path="/tm?/data",
+        storage_backend=STORAGE_BACKEND_LOCAL,
+        accepted_file_extensions={"vcf"},
+        recursive=recursive,
+    )
+    listed = ["/tmp/data/a.vcf", "/tmp/data/sub/b.vcf", "/tmp/other/c.vcf"]
+
+    with patch.object(fs._storage, "find", return_value=listed) as find:
+        files = fs.find_files()
+
+    # The prefix is the root directory, not an empty path (the working directory).
+    assert find.call_args.args == ("/",)
+    if recursive:
+        assert files == ["/tmp/data/a.vcf", "/tmp/data/sub/b.vcf"]
+    else:
+        assert find.call_args.kwargs == {"maxdepth": 3}
+        assert files == ["/tmp/data/a.vcf"]
@@ -1,48 +1,96 @@
+from contextlib import ExitStack
 from unittest.mock import MagicMock, patch
 
 import pytest
+from requests.adapters import DEFAULT_POOLSIZE
 
 from vc_file_upload import __version__
-from vc_file_upload.http_request import http_session
+from vc_file_upload.http_request import (
+    DEFAULT_TIMEOUT,
+    _TimeoutHTTPAdapter,
+    http_session,
+)
+
+
+@pytest.fixture
+def http_patches():
+    """
+    Patch the session building blocks in a single ExitStack instead of
+    nesting a context manager per target.
+    :return:
+    """
+    targets = {
+        "adapter": "vc_file_upload.http_request._TimeoutHTTPAdapter",
+        "session": "requests.Session",
+        "retry": "vc_file_upload.http_request.Retry",
+    }
+    with ExitStack() as stack:
+        yield {
+            name: stack.enter_context(patch(target)) for name, target in targets.items()
+        }
 
 
 @pytest.mark.parametrize(
-    "retry_http_codes, expected_codes",
+    "retry_http_codes, expected_codes, pool_kwargs, expected_pool_maxsize",
     [
-        ([500, 502], [500, 502]),
-        (None, [504, 503, 502, 429]),
+        ([500, 502], [500, 502], {}, DEFAULT_POOLSIZE),
+        (None, [504, 503, 502, 429], {"pool_maxsize": 32}, 32),
     ],
 )
-def test_http_session_configures_headers_and_retries(retry_http_codes, expected_codes):
+def test_http_session_configures_headers_and_retries(
+    http_patches, retry_http_codes, expected_codes, pool_kwargs, expected_pool_maxsize
+):
     token = "test_token"
-    with (
-        patch("vc_file_upload.http_request.HTTPAdapter") as mock_adapter,
-        patch("requests.Session") as mock_session,
-        patch("vc_file_upload.http_request.Retry") as mock_retry,
-    ):
-        mock_client = MagicMock()
-        mock_session.return_value = mock_client
-
-        http_session(token, retries=3, backoff=0.5, retry_http_codes=retry_http_codes)
-
-        mock_retry.assert_called_once_with(
-            total=None,
-            status=3,
-            connect=2,
-            read=0,
-            redirect=0,
-            backoff_factor=0.5,
-            status_forcelist=expected_codes,
-            allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"],
-            other=0,
-        )
-        mock_adapter.assert_called_once_with(max_retries=mock_retry.return_value)
-        mock_client.headers.update.assert_called_once_with(
-            {
-                "Accept": "application/json",
-                "Authorization": f"Bearer {token}",
-                "User-Agent": f"vc-file-upload-client/{__version__}",
-            }
-        )
-        mock_client.mount.assert_any_call("http://", mock_adapter.return_value)
-        mock_client.mount.assert_any_call("https://", mock_adapter.return_value)
+    mock_adapter = http_patches["adapter"]
+    mock_retry = http_patches["retry"]
+    mock_client = MagicMock()
+    http_patches["session"].return_value = mock_client
+
+    http_session(
+        token,
+        retries=3,
+        backoff=0.5,
+        retry_http_codes=retry_http_codes,
+        **pool_kwargs,
+    )
+
+    mock_retry.assert_called_once_with(
+        total=None,
+        status=3,
+        connect=2,
+        read=0,
+        redirect=0,
+        backoff_factor=0.5,
+        status_forcelist=expected_codes,
+        allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"],
+        other=0,
+    )
+    mock_adapter.assert_called_once_with(
+        max_retries=mock_retry.return_value,
+        pool_maxsize=expected_pool_maxsize,
+        timeout=DEFAULT_TIMEOUT,
+    )
+    mock_client.headers.update.assert_called_once_with(
+        {
+            "Accept": "application/json",
+            "User-Agent": f"vc-file-upload-client/{__version__}",
+        }
+    )
+    mock_client.headers.__setitem__.assert_called_once_with(
+        "Authorization", f"Bearer {token}"
+    )
+    mock_client.mount.assert_any_call("http://", mock_adapter.return_value)
+    mock_client.mount.assert_any_call("https://", mock_adapter.return_value)
+
+
+@pytest.mark.parametrize(
+    "timeout, expected_timeout", [(None, (1, 2)), (5, 5), ((3, 4), (3, 4))]
+)
+def test_timeout_adapter_applies_default_timeout(timeout, expected_timeout):
+    adapter = _TimeoutHTTPAdapter(timeout=(1, 2))
+    request = MagicMock()
+
+    with patch("requests.adapters.HTTPAdapter.send") as mock_send:
+        adapter.send(request, timeout=timeout, verify=True)
+
+    mock_send.assert_called_once_with(request, timeout=expected_timeout, verify=True)
@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from vc_file_upload.oci_storage import OCIFileSystem
+
+
+@pytest.fixture
+def oci_fs():
+    with patch.object(OCIFileSystem, "__init__", return_value=None):
+        fs = OCIFileSystem()
+    fs.oci_client = MagicMock()
+    fs.oci_client.create_preauthenticated_request.side_effect = lambda **kwargs: (
+        MagicMock(data=MagicMock(full_path=f"https://par/{kwargs['bucket_name']}/o/"))
+    )
+    return fs
+
+
+def test_sign_creates_object_request(oci_fs):
+    url = oci_fs.sign("bucket@ns/dir/a.vcf", expiration=60)
+
+    assert url == "https://par/bucket/o/"
+    kwargs = oci_fs.oci_client.create_preauthenticated_request.call_args.kwargs
+    details = kwargs["create_preauthenticated_request_details"]
+    assert kwargs["namespace_name"] == "ns"
+    assert details.object_name == "dir/a.vcf"
+    assert details.access_type == "ObjectRead"
+
+
+def test_sign_many_creates_one_request_per_bucket(oci_fs):
+    paths = ["bucket@ns/dir/a b.vcf", "bucket@ns/b.vcf", "other@ns/c.vcf"]
+
+    result = list(oci_fs.sign_many(paths, expiration=60))
+
+    assert result == [
+        ("bucket@ns/dir/a b.vcf", "https://par/bucket/o/dir/a%20b.vcf"),
+        ("bucket@ns/b.vcf", "https://par/bucket/o/b.vcf"),
+        ("other@ns/c.vcf", "https://par/other/o/c.vcf"),
+    ]
+    calls = oci_fs.oci_client.create_preauthenticated_request.call_args_list
+    assert [c.kwargs["bucket_name"] for c in calls] == ["bucket", "other"]
+    assert all(
+        c.kwargs["create_preauthenticated_request_details"].access_type
+        == "AnyObjectRead"
+        for c in calls
+    )
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+from contextlib import ExitStack
 from unittest.mock import patch
 
 import pytest
@@ -14,34 +17,27 @@ from vc_file_upload.storage import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def patch_cloud_filesystems_init():
     """
     Avoid the filesystem initialization that triggers network calls.
+    The patches are entered once per module since no test alters them.
     :return:
     """
-    with patch.object(
-        AzureBlobFileSystem, "__init__", return_value=None
-    ) as mock_azure_init:
-        with patch.object(
-            OCIFileSystem, "__init__", return_value=None
-        ) as mock_oci_init:
-            with patch.object(
-                S3FileSystem, "__init__", return_value=None
-            ) as mock_s3_init:
-                with patch.object(
-                    GCSFileSystem, "__init__", return_value=None
-                ) as mock_gcs_init:
-                    with patch.object(
-                        LocalFileSystem, "__init__", return_value=None
-                    ) as mock_local_init:
-                        yield {
-                            cfg.STORAGE_BACKEND_AWS: mock_s3_init,
-                            cfg.STORAGE_BACKEND_GCP: mock_gcs_init,
-                            cfg.STORAGE_BACKEND_OCI: mock_oci_init,
-                            cfg.STORAGE_BACKEND_AZURE: mock_azure_init,
-                            cfg.STORAGE_BACKEND_LOCAL: mock_local_init,
-                        }
+    backends = {
+        cfg.STORAGE_BACKEND_AWS: S3FileSystem,
+        cfg.STORAGE_BACKEND_GCP: GCSFileSystem,
+        cfg.STORAGE_BACKEND_OCI: OCIFileSystem,
+        cfg.STORAGE_BACKEND_AZURE: AzureBlobFileSystem,
+        cfg.STORAGE_BACKEND_LOCAL: LocalFileSystem,
+    }
+    with ExitStack() as stack:
+        yield {
+            backend: stack.enter_context(
+                patch.object(fs_cls, "__init__", return_value=None)
+            )
+            for backend, fs_cls in backends.items()
+        }
 
 
 @pytest.mark.parametrize(
@@ -111,3 +107,15 @@ def test_create_storage_kwargs_merge(
 ):
     create_storage(storage, **kwargs)
     patch_cloud_filesystems_init[storage].assert_called_with(**expected_kwargs)
+
+
+def test_import_does_not_load_cloud_backends():
+    code = (
+        "import sys, vc_file_upload.storage as s; "
+        "s.create_storage('LOCAL'); "
+        "print(sorted({'s3fs', 'gcsfs', 'ocifs', 'adlfs'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
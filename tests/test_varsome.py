@@ -1,13 +1,21 @@
-import io
+import hashlib
+import logging
 import os.path
-from queue import Queue
-from unittest.mock import MagicMock, call, mock_open, patch
+import threading
+import time
+from unittest.mock import ANY, MagicMock, Mock, call, mock_open, patch
 
 import pytest
+import requests
 from requests import HTTPError
 
 from vc_file_upload.exception import UploadException
-from vc_file_upload.varsome import MAX_SINGLE_UPLOAD_BYTES, VarSomeClinicalFileUploader
+from vc_file_upload.varsome import (
+    CHUNK_UPLOAD_RETRIES,
+    MAX_PARALLEL_RETRIEVALS,
+    MAX_SINGLE_UPLOAD_BYTES,
+    VarSomeClinicalFileUploader,
+)
 
 
 @pytest.fixture
@@ -33,7 +41,7 @@ def mock_http_session_json_response(mock_http_session, success_response_json):
 @pytest.fixture
 def mock_http_session_raise_for_status(mock_http_session_json_response):
     mock_session_instance = mock_http_session_json_response.return_value
-    mock_response = MagicMock()
+    mock_response = Mock()
     mock_response.raise_for_status.side_effect = HTTPError("HTTP Error")
     mock_session_instance.post.return_value = mock_response
     mock_session_instance.put.return_value = mock_response
@@ -45,11 +53,11 @@ def mock_http_session_raise_for_status_on_second_call(
     mock_http_session, success_response_json
 ):
     mock_session_instance = mock_http_session.return_value
-    bad_response = MagicMock()
+    bad_response = Mock()
     bad_response.raise_for_status.side_effect = HTTPError(
-        "HTTP Error", response=MagicMock(status_code=416, json=lambda: {"offset": 2})
+        "HTTP Error", response=Mock(status_code=416, json=lambda: {"offset": 2})
     )
-    good_response = MagicMock()
+    good_response = Mock()
     good_response.json.return_value = success_response_json
     mock_session_instance.post.side_effect = [
         good_response,
@@ -114,7 +122,9 @@ def test_client_context_manager(mock_http_session):
         clinical_api_token="test_token", clinical_base_url="http://example.com"
     )
     with client._http_client_session() as session:
-        mock_http_session.assert_called_once_with("test_token")
+        mock_http_session.assert_called_once_with(
+            "test_token", pool_maxsize=MAX_PARALLEL_RETRIEVALS
+        )
         session.get("http://example.com")
     session.get.assert_called_once_with("http://example.com")
     session.close.assert_called_once()
@@ -170,6 +180,9 @@ def test_upload_local_file(success_response_json, patch_open_file):
         "http://example.com/api/v1/sample-files/upload/",
         data=patch_open_file(),
         headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+        # The server stores the whole file before answering, so there is no
+        # read timeout.
+        timeout=(10, None),
     )
     assert response == success_response_json
 
@@ -215,6 +228,16 @@ def test_upload_local_files(local_files, success_response_json):
     }
 
 
+@pytest.mark.usefixtures("mock_http_session_json_response", "patch_upload_local_file")
+def test_upload_local_files_accepts_iterable(local_files, success_response_json):
+    files, _ = local_files
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="test_token", clinical_base_url="http://example.com"
+    )
+    response = client.upload_local_files(item for item in files.items())
+    assert list(response.values()) == [success_response_json, None]
+
+
 @pytest.mark.usefixtures("mock_http_session_json_response")
 def test_retrieve_external_files(success_response_json):
     client = VarSomeClinicalFileUploader(
@@ -251,6 +274,27 @@ def test_retrieve_external_files(success_response_json):
     }
 
 
+def test_run_concurrently_preserves_order_and_bounds_workers():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def work(key, value):
+        with lock:
+            in_flight.append(key)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(key)
+        return value * 2
+
+    result = VarSomeClinicalFileUploader._run_concurrently(
+        work, ((f"k{i}", i) for i in range(6)), max_workers=2
+    )
+    assert list(result.items()) == [(f"k{i}", i * 2) for i in range(6)]
+    assert max(peak) <= 2
+
+
 def test_files_with_sizes(local_files):
     files, file_size = local_files
     client = VarSomeClinicalFileUploader(
@@ -292,25 +336,6 @@ def test_upload_file_with_strategy(patch_upload_local_file):
         assert mock_upload_local_file_multi_part.call_count == 1
 
 
-def test_calculate_file_md5(tmp_path):
-    md5_sum_expected = "bea8252ff4e80f41719ea13cdf007273"
-    file_path = tmp_path / "test.txt"
-    file_path.write_text("Hello, World!\n")
-
-    queue = Queue()
-    VarSomeClinicalFileUploader._calculate_file_md5(str(file_path), queue)
-    md5_sum_result = queue.get()
-    assert md5_sum_result == md5_sum_expected
-
-
-def test_calculate_file_md5_error(tmp_path):
-    file_path = tmp_path / "test.txt"
-    queue = Queue()
-    VarSomeClinicalFileUploader._calculate_file_md5(str(file_path), queue)
-    md5_sum_result = queue.get()
-    assert isinstance(md5_sum_result, Exception)
-
-
 @pytest.mark.usefixtures("mock_http_session_json_response")
 def test_complete_multipart_upload(success_response_json):
     client = VarSomeClinicalFileUploader(
@@ -321,6 +346,9 @@ def test_complete_multipart_upload(success_response_json):
     session.post.assert_called_once_with(
         "http://example.com/sample-files/filestore-upload/complete/",
         data={"upload_id": "123", "md5": "somehash"},
+        # The server assembles and checks the file before answering, so there
+        # is no read timeout.
+        timeout=(10, None),
     )
     assert result == success_response_json
 
@@ -343,26 +371,21 @@ def test_upload_chunk_success(existing_upload_id, expected_params):
     client = VarSomeClinicalFileUploader(
         clinical_api_token="test_token", clinical_base_url="http://example.com"
     )
-    with patch("io.BytesIO", return_value=io.BytesIO(b"0123456789")) as mock_bytes_io:
-        with (
-            client._http_client_session() as session
-        ):  # just to illustrate context manager usage
-            upload_id = client._upload_chunk(
-                file_name="file.vcf",
-                chunk=b"0123456789",
-                client=session,
-                file_range="0-10/10",
-                upload_id=existing_upload_id,
-            )
-        assert upload_id == "123"
-        session.post.assert_called_once_with(
-            "http://example.com/sample-files/filestore-upload/add/",
-            headers={"Content-Range": "bytes 0-10/10"},
-            files={
-                "data-file": ("file.vcf", mock_bytes_io(), "application/octet-stream")
-            },
-            params=expected_params,
+    with client._http_client_session() as session:
+        upload_id = client._upload_chunk(
+            file_name="file.vcf",
+            chunk=b"0123456789",
+            client=session,
+            file_range="0-10/10",
+            upload_id=existing_upload_id,
         )
+    assert upload_id == "123"
+    session.post.assert_called_once_with(
+        "http://example.com/sample-files/filestore-upload/add/",
+        headers={"Content-Range": "bytes 0-10/10"},
+        files={"data-file": ("file.vcf", b"0123456789", "application/octet-stream")},
+        params=expected_params,
+    )
 
 
 @pytest.mark.usefixtures("mock_http_session_raise_for_status")
@@ -384,65 +407,55 @@ def test_process_multi_part_upload(tmp_path):
         clinical_base_url="http://example.com",
         multipart_upload_chunk_size=6,
     )
-    with patch("io.BytesIO", return_value=io.BytesIO(b"0123456789")) as mock_bytes_io:
-        with client._http_client_session() as session:
-            upload_id = client._process_multi_part_upload(
-                str(p), "file.bin", 10, session
-            )
-        assert upload_id == "123"
-        assert session.post.call_count == 4
-        session.post.assert_has_calls(
-            [
-                call(
-                    "http://example.com/sample-files/filestore-upload/add/",
-                    files={
-                        "data-file": (
-                            "file.bin",
-                            mock_bytes_io(),
-                            "application/octet-stream",
-                        )
-                    },
-                    headers={"Content-Range": "bytes 0-6/10"},
-                    params={},
-                ),
-                call(
-                    "http://example.com/sample-files/filestore-upload/add/",
-                    files={
-                        "data-file": (
-                            "file.bin",
-                            mock_bytes_io(),
-                            "application/octet-stream",
-                        )
-                    },
-                    headers={"Content-Range": "bytes 6-10/10"},
-                    params={"upload_id": "123"},
-                ),
-                call(
-                    "http://example.com/sample-files/filestore-upload/add/",
-                    files={
-                        "data-file": (
-                            "file.bin",
-                            mock_bytes_io(),
-                            "application/octet-stream",
-                        )
-                    },
-                    headers={"Content-Range": "bytes 2-8/10"},
-                    params={"upload_id": "123"},
-                ),
-                call(
-                    "http://example.com/sample-files/filestore-upload/add/",
-                    files={
-                        "data-file": (
-                            "file.bin",
-                            mock_bytes_io(),
-                            "application/octet-stream",
-                        )
-                    },
-                    headers={"Content-Range": "bytes 8-10/10"},
-                    params={"upload_id": "123"},
-                ),
-            ]
-        )
+    with client._http_client_session() as session:
+        # Chunks are views of reused read buffers, so copy them as they are sent.
+        responses = session.post.side_effect
+        sent = []
+
+        def post(url, files, headers, params):
+            name, chunk, content_type = files["data-file"]
+            sent.append((url, name, bytes(chunk), content_type, headers, params))
+            return next(responses)
+
+        session.post.side_effect = post
+        upload_id = client._process_multi_part_upload(str(p), "file.bin", 10, session)
+    assert upload_id == "123"
+    url = "http://example.com/sample-files/filestore-upload/add/"
+    content_type = "application/octet-stream"
+    assert sent == [
+        (
+            url,
+            "file.bin",
+            b"012345",
+            content_type,
+            {"Content-Range": "bytes 0-6/10"},
+            {},
+        ),
+        (
+            url,
+            "file.bin",
+            b"6789",
+            content_type,
+            {"Content-Range": "bytes 6-10/10"},
+            {"upload_id": "123"},
+        ),
+        (
+            url,
+            "file.bin",
+            b"234567",
+            content_type,
+            {"Content-Range": "bytes 2-8/10"},
+            {"upload_id": "123"},
+        ),
+        (
+            url,
+            "file.bin",
+            b"89",
+            content_type,
+            {"Content-Range": "bytes 8-10/10"},
+            {"upload_id": "123"},
+        ),
+    ]
 
 
 def test_process_multi_part_upload_returns_none_on_non_416_error(tmp_path):
@@ -458,7 +471,7 @@ def test_process_multi_part_upload_returns_none_on_non_416_error(tmp_path):
     with patch.object(
         VarSomeClinicalFileUploader, "_upload_chunk", side_effect=side_effect
     ):
-        result = client._process_multi_part_upload(str(p), "f.bin", 6, MagicMock())
+        result = client._process_multi_part_upload(str(p), "f.bin", 6, Mock())
         assert result is None
 
 
@@ -471,3 +484,175 @@ def test_process_multi_part_upload_returns_none_on_io_error():
     with client._http_client_session() as session:
         result = client._process_multi_part_upload("/no/file", "f.bin", 10, session)
         assert result is None
+
+
+def test_process_multi_part_upload_reads_chunks_in_order(tmp_path, patch_upload_chunk):
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="t", multipart_upload_chunk_size=4
+    )
+    chunks = []
+    patch_upload_chunk.side_effect = lambda name, chunk, *args: (
+        chunks.append(bytes(chunk)) or patch_upload_chunk.return_value
+    )
+    session = Mock()
+    client._process_multi_part_upload(str(p), "file.bin", 10, session)
+    assert chunks == [b"0123", b"4567", b"89"]
+    assert [c.args[3] for c in patch_upload_chunk.call_args_list] == [
+        "0-4/10",
+        "4-8/10",
+        "8-10/10",
+    ]
+
+
+@pytest.mark.usefixtures("mock_http_session_raise_for_status_on_second_call")
+def test_process_multi_part_upload_checksum_covers_file_once(tmp_path):
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="test_token", multipart_upload_chunk_size=6
+    )
+    checksum = hashlib.md5()
+    with client._http_client_session() as session:
+        client._process_multi_part_upload(
+            str(p), "file.bin", 10, session, checksum=checksum
+        )
+    assert checksum.hexdigest() == hashlib.md5(b"0123456789").hexdigest()
+
+
+@pytest.mark.usefixtures("mock_http_session_json_response")
+def test_upload_local_file_multipart_completes_with_md5(tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="vc_file_upload")
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="test_token",
+        clinical_base_url="http://example.com",
+        multipart_upload_chunk_size=4,
+    )
+    with client._http_client_session() as session:
+        client._upload_local_file_multipart(str(p), "file.bin", 10, session)
+    session.post.assert_called_with(
+        "http://example.com/sample-files/filestore-upload/complete/",
+        data={"upload_id": "123", "md5": hashlib.md5(b"0123456789").hexdigest()},
+        timeout=(10, None),
+    )
+    # Per-chunk messages are only logged at DEBUG, with a summary at INFO.
+    assert "Uploaded file file.bin (10 bytes)" in caplog.messages
+    assert not any(m.startswith("Uploading chunk") for m in caplog.messages)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "posix_fadvise"), reason="posix_fadvise is not available"
+)
+@pytest.mark.usefixtures("patch_upload_chunk")
+def test_process_multi_part_upload_advises_sequential_reads(tmp_path):
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="t", multipart_upload_chunk_size=4
+    )
+    with patch("vc_file_upload.varsome.os.posix_fadvise") as mock_fadvise:
+        client._process_multi_part_upload(str(p), "file.bin", 10, Mock())
+    mock_fadvise.assert_called_once_with(ANY, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+@pytest.mark.parametrize(
+    "error, expected_posts",
+    [
+        (requests.exceptions.ConnectionError("reset"), 2),
+        (requests.exceptions.ReadTimeout("slow"), 2),
+        (requests.exceptions.SSLError("bad certificate"), 1),
+    ],
+)
+def test_upload_chunk_retries_transient_errors(error, expected_posts):
+    client = VarSomeClinicalFileUploader(clinical_api_token="t")
+    session = Mock()
+    session.post.side_effect = [
+        error,
+        Mock(json=Mock(return_value={"upload_id": "123"})),
+    ]
+
+    with patch("vc_file_upload.varsome.time.sleep") as mock_sleep:
+        if expected_posts == 1:
+            with pytest.raises(UploadException):
+                client._upload_chunk("f.vcf", b"x", session, "0-1/1")
+        else:
+            assert client._upload_chunk("f.vcf", b"x", session, "0-1/1") == "123"
+
+    assert session.post.call_count == expected_posts
+    assert mock_sleep.call_count == expected_posts - 1
+
+
+def test_upload_chunk_gives_up_after_retries():
+    client = VarSomeClinicalFileUploader(clinical_api_token="t")
+    session = Mock()
+    session.post.side_effect = requests.exceptions.ConnectionError("reset")
+
+    with patch("vc_file_upload.varsome.time.sleep"):
+        with pytest.raises(UploadException):
+            client._upload_chunk("f.vcf", b"x", session, "0-1/1")
+
+    assert session.post.call_count == CHUNK_UPLOAD_RETRIES + 1
+
+
+@pytest.mark.parametrize(
+    "field_name",
+    [
+        "max_single_file_upload_size_bytes",
+        "multipart_upload_chunk_size",
+        "max_parallel_transfers",
+        "max_parallel_retrievals",
+    ],
+)
+@pytest.mark.parametrize("value", [0, -1])
+def test_init_rejects_non_positive_sizes(field_name, value):
+    with pytest.raises(ValueError, match=field_name):
+        VarSomeClinicalFileUploader(clinical_api_token="t", **{field_name: value})
+
+
+def test_process_multi_part_upload_done_when_server_has_whole_file(tmp_path):
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="t", multipart_upload_chunk_size=6
+    )
+    # The last chunk was stored, but its response was lost and the retry
+    # is rejected with the offset at the end of the file.
+    already_stored = UploadException(
+        "fail",
+        original_exception=HTTPError(
+            "HTTP Error", response=Mock(status_code=416, json=lambda: {"offset": 10})
+        ),
+    )
+
+    with patch.object(
+        VarSomeClinicalFileUploader,
+        "_upload_chunk",
+        side_effect=["123", already_stored],
+    ) as mock_upload_chunk:
+        result = client._process_multi_part_upload(str(p), "file.bin", 10, Mock())
+
+    assert result == "123"
+    assert [c.args[3] for c in mock_upload_chunk.call_args_list] == [
+        "0-6/10",
+        "6-10/10",
+    ]
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "posix_fadvise"), reason="posix_fadvise is not available"
+)
+def test_process_multi_part_upload_ignores_fadvise_errors(tmp_path, patch_upload_chunk):
+    p = tmp_path / "file.bin"
+    p.write_bytes(b"0123456789")
+    client = VarSomeClinicalFileUploader(
+        clinical_api_token="t", multipart_upload_chunk_size=4
+    )
+    with patch(
+        "vc_file_upload.varsome.os.posix_fadvise", side_effect=OSError("not supported")
+    ):
+        result = client._process_multi_part_upload(str(p), "file.bin", 10, Mock())
+    assert result == patch_upload_chunk.return_value
+    assert patch_upload_chunk.call_count == 3
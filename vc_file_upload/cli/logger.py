@@ -6,13 +6,17 @@ from vc_file_upload.logging_config import get_library_logger
 def _get_logger():
     """
     Returns a logger instance for the dx_vc_file_transfer module.
+    The stream handler is only attached once, so repeated calls do not
+    emit every record multiple times.
     """
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
     logger = get_library_logger()
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
     return logger
 
 
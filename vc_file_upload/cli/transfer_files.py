@@ -15,7 +15,11 @@ from vc_file_upload.config import (
     STORAGE_BACKEND_OCI,
 )
 from vc_file_upload.filesystem import FileSystem
-from vc_file_upload.varsome import VarSomeClinicalFileUploader
+from vc_file_upload.varsome import (
+    MAX_PARALLEL_RETRIEVALS,
+    MAX_PARALLEL_TRANSFERS,
+    VarSomeClinicalFileUploader,
+)
 
 
 def _parse_extensions(extensions: str) -> Set[str]:
@@ -24,10 +28,11 @@ def _parse_extensions(extensions: str) -> Set[str]:
     Leading dots are removed and values are lowercased. Only allowed
     extensions are retained.
     """
-    extensions = {
-        e.strip().lower().lstrip(".") for e in extensions.split(",") if e.strip()
+    return {
+        e
+        for e in (e.strip().lower().lstrip(".") for e in extensions.split(","))
+        if e in ALLOWED_FILE_EXTENSIONS
     }
-    return {e for e in extensions if e in ALLOWED_FILE_EXTENSIONS}
 
 
 def _create_filesystem(
@@ -35,6 +40,8 @@ def _create_filesystem(
     backend: str,
     accepted_extensions: Set[str],
     signed_url_expiration: int,
+    bucket_signing: bool = False,
+    recursive: bool = True,
 ) -> FileSystem:
     """
     Instantiates a FileSystem for the selected backend and root path.
@@ -44,17 +51,35 @@ def _create_filesystem(
         storage_backend=backend,
         accepted_file_extensions=accepted_extensions or set(ALLOWED_FILE_EXTENSIONS),
         signed_url_expiration=signed_url_expiration,
+        bucket_signing=bucket_signing,
+        recursive=recursive,
     )
 
 
-def _create_uploader(base_url: str) -> VarSomeClinicalFileUploader:
+def _create_uploader(
+    base_url: str,
+    max_parallel_transfers: int = MAX_PARALLEL_TRANSFERS,
+    max_parallel_retrievals: int = MAX_PARALLEL_RETRIEVALS,
+) -> VarSomeClinicalFileUploader:
     """
     Instantiates a VarSomeClinicalFileUploader using the token from the environment
-    and the provided base URL.
+    and the provided base URL and concurrency limits. The multipart chunk size can
+    be overridden with VCLIN_MULTIPART_CHUNK_SIZE (in bytes).
     """
     if token := os.getenv("VCLIN_API_TOKEN"):
+        uploader_kwargs = {
+            "max_parallel_transfers": max_parallel_transfers,
+            "max_parallel_retrievals": max_parallel_retrievals,
+        }
+        if chunk_size := os.getenv("VCLIN_MULTIPART_CHUNK_SIZE"):
+            try:
+                uploader_kwargs["multipart_upload_chunk_size"] = _positive_int(
+                    chunk_size
+                )
+            except (ValueError, argparse.ArgumentTypeError) as e:
+                raise ValueError(f"Invalid VCLIN_MULTIPART_CHUNK_SIZE: {e}") from e
         return VarSomeClinicalFileUploader(
-            clinical_api_token=token, clinical_base_url=base_url
+            clinical_api_token=token, clinical_base_url=base_url, **uploader_kwargs
         )
     else:
         raise ValueError(
@@ -70,24 +95,43 @@ def _transfer(
     """
     Executes the transfer based on the storage backend. For local storage it performs
     uploads of local files. For remote backends, it requests retrieval of external files
-    via pre-signed URLs.
+    via pre-signed URLs. Files are transferred as soon as they are discovered, so
+    the search overlaps with the transfers.
     """
-    files = fs.retrieve_files_with_names()
-    if not files:
+    files = fs.iter_files_with_names()
+
+    if backend == STORAGE_BACKEND_LOCAL:
+        logger.info("Uploading local files to VarSome Clinical")
+        result = uploader.upload_local_files(files)
+    else:
+        logger.info("Requesting VarSome Clinical to retrieve external files")
+        result = uploader.retrieve_external_files(files)
+
+    if not result:
         logger.info("No files found to transfer", extra={"root_path": fs.root_path})
         return {}
 
+    # Files are transferred as they are found, so the count is only known now.
     logger.info(
-        "Discovered files for transfer",
-        extra={"count": len(files), "backend": backend, "root_path": fs.root_path},
+        "Transferred files",
+        extra={
+            "count": len(result),
+            "failed": sum(response is None for response in result.values()),
+            "backend": backend,
+            "root_path": fs.root_path,
+        },
     )
+    return result
 
-    if backend == STORAGE_BACKEND_LOCAL:
-        logger.info("Uploading local files to VarSome Clinical")
-        return uploader.upload_local_files(files)
-    else:
-        logger.info("Requesting VarSome Clinical to retrieve external files")
-        return uploader.retrieve_external_files(files)
+
+def _positive_int(value: str) -> int:
+    """
+    argparse type for options that only accept integers greater than zero.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -137,6 +181,33 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Signed URL expiration in seconds for "
         "remote backends (default: %(default)s)",
     )
+    parser.add_argument(
+        "--max-parallel-transfers",
+        type=_positive_int,
+        default=MAX_PARALLEL_TRANSFERS,
+        help="Maximum number of local files uploaded concurrently "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-parallel-retrievals",
+        type=_positive_int,
+        default=MAX_PARALLEL_RETRIEVALS,
+        help="Maximum number of concurrent retrieval requests for files on "
+        "remote backends (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--non-recursive",
+        action="store_true",
+        help="Only transfer files directly under the root path, "
+        "without searching its subdirectories",
+    )
+    parser.add_argument(
+        "--oci-bucket-signing",
+        action="store_true",
+        help="For OCI, sign all files with a single bucket-wide pre-authenticated "
+        "request instead of one per file. The URLs then grant read access to the "
+        "whole bucket until they expire",
+    )
     return parser
 
 
@@ -163,9 +234,15 @@ def main(argv: Optional[list] = None) -> int:
             backend=args.backend,
             accepted_extensions=accepted,
             signed_url_expiration=args.signed_url_expiration,
+            bucket_signing=args.oci_bucket_signing,
+            recursive=not args.non_recursive,
         )
 
-        uploader = _create_uploader(args.vclin_base_url)
+        uploader = _create_uploader(
+            args.vclin_base_url,
+            max_parallel_transfers=args.max_parallel_transfers,
+            max_parallel_retrievals=args.max_parallel_retrievals,
+        )
         result = _transfer(args.backend, fs, uploader)
 
         logger.info(
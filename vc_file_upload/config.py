@@ -14,7 +14,7 @@ DEFAULT_STORAGE_BACKEND = STORAGE_BACKEND_LOCAL
 
 STORAGE_BACKEND_TYPE = Literal["AWS", "GCP", "OCI", "AZURE", "LOCAL"]
 
-ALLOWED_FILE_EXTENSIONS = {"vcf", "vcf.gz", "fastq.gz", "bam"}
+ALLOWED_FILE_EXTENSIONS = frozenset({"vcf", "vcf.gz", "fastq.gz", "bam"})
 
 
 def get_aws_config():
@@ -51,16 +51,17 @@ def get_azure_config():
     }
 
 
-def get_storage_config(backend):
-    config_getters = {
-        STORAGE_BACKEND_AWS: get_aws_config,
-        STORAGE_BACKEND_GCP: get_gcp_config,
-        STORAGE_BACKEND_OCI: get_oci_config,
-        STORAGE_BACKEND_AZURE: get_azure_config,
-        STORAGE_BACKEND_LOCAL: lambda: {},
-    }
+_CONFIG_GETTERS = {
+    STORAGE_BACKEND_AWS: get_aws_config,
+    STORAGE_BACKEND_GCP: get_gcp_config,
+    STORAGE_BACKEND_OCI: get_oci_config,
+    STORAGE_BACKEND_AZURE: get_azure_config,
+    STORAGE_BACKEND_LOCAL: dict,
+}
 
-    if getter := config_getters.get(backend):
+
+def get_storage_config(backend):
+    if getter := _CONFIG_GETTERS.get(backend):
         return getter()
     logger.warning("Unknown storage backend requested", extra={"backend": backend})
     return {}
@@ -1,13 +1,21 @@
+import collections
 import dataclasses
-import pathlib
-import sys
-from typing import Dict, List, Optional, Set
+import functools
+import os
+import posixpath
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AbstractSet, Any, Dict, Iterator, List, Optional, Tuple
+
+from fsspec.core import split_protocol
+from fsspec.utils import glob_translate
 
 from vc_file_upload import exception
 from vc_file_upload.config import (
     ALLOWED_FILE_EXTENSIONS,
     DEFAULT_STORAGE_BACKEND,
     STORAGE_BACKEND_LOCAL,
+    STORAGE_BACKEND_OCI,
     STORAGE_BACKEND_TYPE,
 )
 from vc_file_upload.logging_config import get_library_logger
@@ -15,8 +23,19 @@ from vc_file_upload.storage import create_storage
 
 logger = get_library_logger()
 
+_GLOB_MAGIC = re.compile(r"[*?\[]")
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """
+    Translates a glob pattern into a compiled regular expression. The result
+    is cached, since the same root path is usually listed more than once.
+    """
+    return re.compile(glob_translate(pattern))
 
-@dataclasses.dataclass(kw_only=True)
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
 class FileSystem:
     """
     Represents a file system for managing and querying files across
@@ -36,73 +55,168 @@ class FileSystem:
     :type storage_backend: Optional[STORAGE_BACKEND_TYPE]
     :ivar accepted_file_extensions: The set of allowed file extensions for file
         operations, defaulting to a pre-defined set (`ALLOWED_FILE_EXTENSIONS`).
-    :type accepted_file_extensions: Set[str]
+        It is stored as a frozenset, since instances are immutable.
+    :type accepted_file_extensions: AbstractSet[str]
+    :ivar signed_url_expiration: The validity of signed URLs in seconds.
+    :type signed_url_expiration: int
+    :ivar max_parallel_signing: The maximum number of URLs signed concurrently
+        for bucket storage. Signing may require a request per file (e.g. OCI),
+        so it is parallelized. Defaults to 32.
+    :type max_parallel_signing: int
+    :ivar bucket_signing: Only for OCI. Signs all files with a single bucket-wide
+        pre-authenticated request instead of one request per file. Note that
+        the signed URLs then grant read access to the whole bucket until they
+        expire. Defaults to False.
+    :type bucket_signing: bool
+    :ivar recursive: Whether files in subdirectories of the root path are
+        included. When False, only the files directly under the root path are
+        returned, and a single level is listed. With wildcards in the root path,
+        some backends (e.g. GCS, Azure) may still list the whole tree below the
+        wildcard-free prefix and the deeper files are filtered out. Defaults to True.
+    :type recursive: bool
     """
 
     root_path: str
     storage_backend: Optional[STORAGE_BACKEND_TYPE] = DEFAULT_STORAGE_BACKEND
-    accepted_file_extensions: Set[str] = dataclasses.field(
-        default_factory=lambda: set(ALLOWED_FILE_EXTENSIONS)
-    )
+    accepted_file_extensions: AbstractSet[str] = ALLOWED_FILE_EXTENSIONS
     signed_url_expiration: int = 86400
+    max_parallel_signing: int = 32
+    bucket_signing: bool = False
+    recursive: bool = True
+    _file_pattern: re.Pattern = dataclasses.field(init=False, repr=False, compare=False)
+    _storage: Any = dataclasses.field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.root_path:
             raise ValueError("root_path cannot be empty")
         if not self.accepted_file_extensions:
             raise ValueError("accepted_file_extensions cannot be empty")
-
-        for accepted_ext in self.accepted_file_extensions:
-            if accepted_ext not in ALLOWED_FILE_EXTENSIONS:
+        if self.bucket_signing and self.storage_backend != STORAGE_BACKEND_OCI:
+            raise ValueError("bucket_signing is only supported for OCI storage")
+        if self.storage_backend != STORAGE_BACKEND_LOCAL:
+            bucket = split_protocol(self.root_path)[1].partition("/")[0]
+            if _GLOB_MAGIC.search(bucket):
+                # Listing buckets by pattern would list the whole account.
                 raise ValueError(
-                    f"accepted_file_extension '{accepted_ext}' is not supported"
+                    f"wildcards are not supported in the bucket name '{bucket}'"
                 )
 
-        self._storage = create_storage(self.storage_backend)
+        accepted = frozenset(self.accepted_file_extensions)
+        if unsupported := accepted - ALLOWED_FILE_EXTENSIONS:
+            raise ValueError(
+                "accepted_file_extension '{}' is not supported".format(
+                    "', '".join(sorted(unsupported))
+                )
+            )
+
+        # The dataclass is frozen, so derived attributes bypass __setattr__.
+        object.__setattr__(self, "accepted_file_extensions", accepted)
+        object.__setattr__(
+            self,
+            "_file_pattern",
+            re.compile(
+                r"\.(?:{})$".format(
+                    "|".join(re.escape(ext) for ext in self.accepted_file_extensions)
+                )
+            ),
+        )
+        object.__setattr__(self, "_storage", create_storage(self.storage_backend))
 
     def _build_path(self, *paths: str) -> str:
         """
         Builds a filesystem path by joining the provided path components with the
-        root path, considering the appropriate path-handling class depending
-        on the storage backend and the operating system.
+        root path. Any protocol prefix of the root path (e.g. "s3://") is removed
+        and "/" is used as separator, which is the form of the paths returned by
+        fsspec for every backend. Local paths are made absolute.
 
         :param paths: Components of the path to be joined with the root path.
         :type paths: str
         :return: A string representation of the constructed filesystem path.
         :rtype: str
         """
-        pathlib_cls = pathlib.PurePath
-        if self.storage_backend != STORAGE_BACKEND_LOCAL and sys.platform == "win32":
-            pathlib_cls = pathlib.PurePosixPath
+        root_path = split_protocol(self.root_path)[1]
+        if self.storage_backend == STORAGE_BACKEND_LOCAL:
+            path = os.path.abspath(os.path.join(root_path, *paths))
+            return path.replace(os.sep, "/")
+        return "/".join([root_path.rstrip("/"), *paths])
 
-        return str(pathlib_cls(self.root_path, *paths))
-
-    def _find_files_by_pattern(self, glob_pattern: str) -> List[str]:
+    def _list_files(self) -> Iterator[str]:
         """
-        Finds files in the storage system that match the provided glob pattern.
+        Lists all files under the root path, traversing the storage once
+        regardless of how many file extensions are accepted. Local storage
+        is walked lazily, one directory at a time, while bucket storage is listed
+        with a single paginated call. The root path may contain glob wildcards,
+        except in the bucket name. If the file system is not recursive, only the
+        files directly under the root path are returned: local storage is walked
+        one level deep and bucket storage is listed with a single delimited call.
 
-        :param glob_pattern: The glob pattern to match file paths against.
-        :type glob_pattern: str
-        :return: A list of file paths that match the provided glob pattern.
-        :rtype: List[str]
+        :return: An iterator over all file paths under the root path.
+        :rtype: Iterator[str]
         :raises exception.StorageException: If an error occurs while
                                             fetching the file paths.
         """
+        search_path = self._build_path()
+        maxdepth = None if self.recursive else 1
         try:
-            search_path = self._build_path(glob_pattern)
-            return self._storage.glob(search_path)
+            if _GLOB_MAGIC.search(search_path):
+                # Wildcards in the root path: list only below its wildcard-free
+                # prefix, which object stores apply server side, and keep the
+                # files that are under a directory matching the root path.
+                wildcard_at = _GLOB_MAGIC.search(search_path).start()
+                head, separator, _ = search_path[:wildcard_at].rpartition("/")
+                # Keep the separator of a root directory ("/" or "C:/"), since an
+                # empty prefix would make fsspec list the working directory.
+                prefix = head if head and not head.endswith(":") else head + separator
+                if self.recursive:
+                    root_pattern = _compile_glob(f"{search_path}/**")
+                else:
+                    root_pattern = _compile_glob(f"{search_path}/*")
+                    # The files are one level below the deepest wildcard,
+                    # unless a recursive wildcard matches any depth.
+                    tail = search_path.removeprefix(prefix).strip("/")
+                    maxdepth = None if "**" in tail else tail.count("/") + 2
+                # A non-recursive pattern ends with "/*", which does not match
+                # "/", so it also drops deeper files of backends ignoring maxdepth.
+                for file in self._storage.find(prefix, maxdepth=maxdepth):
+                    if root_pattern.match(file):
+                        yield file
+            elif self.storage_backend == STORAGE_BACKEND_LOCAL:
+                for root, _, files in self._storage.walk(
+                    search_path, maxdepth=maxdepth
+                ):
+                    for name in files:
+                        yield posixpath.join(root, name)
+            elif self.recursive:
+                yield from self._storage.find(search_path)
+            else:
+                # Not every backend honors the maxdepth of find() (e.g. adlfs),
+                # while ls() is a single delimited listing on all of them.
+                for entry in self._storage.ls(search_path, detail=True):
+                    if entry["type"] == "file":
+                        yield entry["name"]
         except Exception as e:
             logger.exception(
                 "File search failed",
                 extra={
-                    "glob_pattern": glob_pattern,
+                    "search_path": search_path,
                     "error": str(e),
                 },
             )
             raise exception.StorageException(
-                f"Failed to find files matching pattern '{glob_pattern}': {str(e)}"
+                f"Failed to list files under '{search_path}': {str(e)}"
             ) from e
 
+    def _iter_files(self) -> Iterator[str]:
+        """
+        Lazily yields file paths matching the accepted file extensions.
+
+        :return: An iterator over the matching file paths.
+        :rtype: Iterator[str]
+        """
+        for file in self._list_files():
+            if self._file_pattern.search(file):
+                yield file
+
     def find_files(self) -> List[str]:
         """
         Finds and retrieves a list of file paths based on the accepted file extensions.
@@ -110,30 +224,71 @@ class FileSystem:
         :return: A list of file paths matching the accepted file extensions.
         :rtype: List[str]
         """
-        patterns = [f"**/*.{ext}" for ext in self.accepted_file_extensions]
-        all_files = []
+        return list(self._iter_files())
 
-        for pattern in patterns:
-            files = self._find_files_by_pattern(pattern)
-            all_files.extend(files)
+    def iter_files_with_names(self) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily yields file paths and their corresponding names as they are found,
+        so that callers can start transferring files before the search completes.
+        For bucket storage, the file paths are yielded as signed URLs.
+
+        :return: An iterator over (file path or URL, file name) tuples.
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        logger.info("Retrieving files from filesystem under %s", self.root_path)
+        if self.storage_backend == STORAGE_BACKEND_LOCAL:
+            for file in self._iter_files():
+                yield file, self._file_name(file)
+            return
+        if self.bucket_signing:
+            for file, url in self._storage.sign_many(
+                self._iter_files(), expiration=self.signed_url_expiration
+            ):
+                yield url, self._file_name(file)
+            return
+
+        # Keep a bounded window of signatures in flight, so that neither the
+        # listing nor the pending futures are fully materialized.
+        window = 2 * self.max_parallel_signing
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.max_parallel_signing) as pool:
+            for file in self._iter_files():
+                pending.append((file, pool.submit(self._sign, file)))
+                if len(pending) >= window:
+                    file, url = pending.popleft()
+                    yield url.result(), self._file_name(file)
+            while pending:
+                file, url = pending.popleft()
+                yield url.result(), self._file_name(file)
+
+    @staticmethod
+    def _file_name(file: str) -> str:
+        """
+        Returns the file name of a path returned by the storage backend.
+        fsspec uses "/" as separator for every backend, including local
+        storage on Windows, so a string partition is enough.
+
+        :param file: The file path.
+        :type file: str
+        :return: The last component of the path.
+        :rtype: str
+        """
+        return file.rpartition("/")[2]
+
+    def _sign(self, file: str) -> str:
+        """
+        Creates a signed URL for a file in bucket storage.
 
-        return all_files
+        :param file: The path of the file in the bucket.
+        :type file: str
+        :return: The signed URL.
+        :rtype: str
+        """
+        return self._storage.sign(file, expiration=self.signed_url_expiration)
 
     def retrieve_files_with_names(self) -> Optional[Dict[str, str]]:
         """
         Returns a dictionary containing file paths and their corresponding names.
         For bucket storage, the file paths are returned as URLs.
         """
-        logger.info("Retrieving files from filesystem under %s", self.root_path)
-        if files := self.find_files():
-            return (
-                {file: pathlib.Path(file).name for file in files}
-                if self.storage_backend == STORAGE_BACKEND_LOCAL
-                else {
-                    self._storage.sign(
-                        file, expiration=self.signed_url_expiration
-                    ): pathlib.Path(file).name
-                    for file in files
-                }
-            )
-        return None
+        return dict(self.iter_files_with_names()) or None
@@ -1,16 +1,50 @@
-from typing import List
+from typing import List, Tuple, Union
 
 import requests
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter, Retry
 
 from vc_file_upload import __version__
 
+_STATIC_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": f"vc-file-upload-client/{__version__}",
+}
+
+# (connect, read) timeout in seconds, for requests that do not set their own
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout to requests sent without one.
+    The timeout is filled in once per request when it is sent, so the session
+    itself does not need to be wrapped.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["timeout"]
+
+    def __init__(
+        self,
+        *args,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        **kwargs,
+    ):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
 
 def http_session(
     token: str,
     retries: int = 5,
     backoff: float = 1.0,
     retry_http_codes: List[int] = None,
+    pool_maxsize: int = DEFAULT_POOLSIZE,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
 ) -> requests.Session:
     """
     Creates and configures an HTTP session with retry capabilities
@@ -27,6 +61,13 @@ def http_session(
     :param retry_http_codes: The list of HTTP status codes that should trigger a retry.
         Defaults to [503, 502, 429] if not specified.
     :type retry_http_codes: List[int]
+    :param pool_maxsize: The maximum number of connections kept alive per host.
+        Should be at least the number of threads sharing the session, otherwise
+        connections are discarded and re-established.
+    :type pool_maxsize: int
+    :param timeout: The default timeout in seconds, either a single value or a
+        (connect, read) tuple, for requests that do not specify one.
+    :type timeout: Union[float, Tuple[float, float]]
     :return: A configured `requests.Session` object with custom retry logic and
         authorization headers.
     :rtype: requests.Session
@@ -34,11 +75,6 @@ def http_session(
     if retry_http_codes is None:
         retry_http_codes = [504, 503, 502, 429]
 
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {token}",
-        "User-Agent": f"vc-file-upload-client/{__version__}",
-    }
     retry_policy = Retry(
         total=None,
         status=retries,
@@ -50,9 +86,12 @@ def http_session(
         allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"],
         other=0,
     )
-    adapter = HTTPAdapter(max_retries=retry_policy)
+    adapter = _TimeoutHTTPAdapter(
+        max_retries=retry_policy, pool_maxsize=pool_maxsize, timeout=timeout
+    )
     session = requests.Session()
-    session.headers.update(headers)
+    session.headers.update(_STATIC_HEADERS)
+    session.headers["Authorization"] = f"Bearer {token}"
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
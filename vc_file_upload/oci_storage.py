@@ -0,0 +1,71 @@
+import datetime
+import pathlib
+from typing import Iterable, Iterator, Tuple
+from urllib.parse import quote
+
+from oci.object_storage.models import CreatePreauthenticatedRequestDetails
+from ocifs import OCIFileSystem as BaseOCIFileSystem
+
+
+class OCIFileSystem(BaseOCIFileSystem):
+
+    def sign(self, path, expiration=100, **kwargs):
+        bucket, namespace, object_name = self.split_path(path)
+        return self._create_preauthenticated_request(
+            bucket,
+            namespace,
+            expiration,
+            name=pathlib.Path(object_name).name,
+            access_type=CreatePreauthenticatedRequestDetails.ACCESS_TYPE_OBJECT_READ,
+            object_name=object_name,
+        )
+
+    def sign_many(
+        self, paths: Iterable[str], expiration: int = 100
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Signs objects with a single bucket-wide read pre-authenticated request
+        per bucket, instead of one request per object. The object URLs are
+        built client side from the URL of the bucket request.
+
+        The bucket request grants read access to every object in the bucket
+        until it expires, not only to the given paths.
+
+        :param paths: The paths of the objects to sign.
+        :type paths: Iterable[str]
+        :param expiration: The validity of the signed URLs in seconds.
+        :type expiration: int
+        :return: An iterator over (path, signed URL) tuples, in the order of paths.
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        bucket_urls = {}
+        for path in paths:
+            bucket, namespace, object_name = self.split_path(path)
+            if (bucket, namespace) not in bucket_urls:
+                bucket_urls[bucket, namespace] = self._create_preauthenticated_request(
+                    bucket,
+                    namespace,
+                    expiration,
+                    name=bucket,
+                    access_type=(
+                        CreatePreauthenticatedRequestDetails.ACCESS_TYPE_ANY_OBJECT_READ
+                    ),
+                )
+            bucket_url = bucket_urls[bucket, namespace].rstrip("/")
+            yield path, f"{bucket_url}/{quote(object_name)}"
+
+    def _create_preauthenticated_request(
+        self, bucket, namespace, expiration, **details
+    ) -> str:
+        expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=expiration
+        )
+        pre_request = CreatePreauthenticatedRequestDetails(
+            time_expires=expires, **details
+        )
+        response = self.oci_client.create_preauthenticated_request(
+            namespace_name=namespace,
+            bucket_name=bucket,
+            create_preauthenticated_request_details=pre_request,
+        )
+        return response.data.full_path
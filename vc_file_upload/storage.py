@@ -1,50 +1,55 @@
-import datetime
-import pathlib
-from typing import Optional, Union
+import importlib
+from typing import TYPE_CHECKING, Optional, Union
 
-from adlfs import AzureBlobFileSystem
 from fsspec.implementations.local import LocalFileSystem
-from gcsfs import GCSFileSystem
-from oci.object_storage.models import CreatePreauthenticatedRequestDetails
-from ocifs import OCIFileSystem as BaseOCIFileSystem
-from s3fs import S3FileSystem
 
 from vc_file_upload import config
 from vc_file_upload.exception import StorageException, UnknownStorageException
 from vc_file_upload.logging_config import get_library_logger
 
+if TYPE_CHECKING:
+    from adlfs import AzureBlobFileSystem
+    from gcsfs import GCSFileSystem
+    from s3fs import S3FileSystem
+
+    from vc_file_upload.oci_storage import OCIFileSystem
+
 logger = get_library_logger()
 
+# The cloud SDKs are heavy to import, so each backend is only imported
+# when it is requested, as (module, class name).
+_CLOUD_FILESYSTEMS = {
+    config.STORAGE_BACKEND_AWS: ("s3fs", "S3FileSystem"),
+    config.STORAGE_BACKEND_GCP: ("gcsfs", "GCSFileSystem"),
+    config.STORAGE_BACKEND_OCI: ("vc_file_upload.oci_storage", "OCIFileSystem"),
+    config.STORAGE_BACKEND_AZURE: ("adlfs", "AzureBlobFileSystem"),
+}
 
-class OCIFileSystem(BaseOCIFileSystem):
 
-    def sign(self, path, expiration=100, **kwargs):
-        bucket, namespace, object_name = self.split_path(path)
-        expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-            seconds=expiration
-        )
-        access_type = CreatePreauthenticatedRequestDetails.ACCESS_TYPE_OBJECT_READ
-        pre_request = CreatePreauthenticatedRequestDetails(
-            name=pathlib.Path(object_name).name,
-            access_type=access_type,
-            time_expires=expires,
-            object_name=object_name,
-        )
-        response = self.oci_client.create_preauthenticated_request(
-            namespace_name=namespace,
-            bucket_name=bucket,
-            create_preauthenticated_request_details=pre_request,
-        )
-        return response.data.full_path
+def _import_filesystem(module_name: str, class_name: str) -> type:
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name: str) -> type:
+    # Keep the cloud filesystem classes importable from this module.
+    for module_name, class_name in _CLOUD_FILESYSTEMS.values():
+        if name == class_name:
+            return _import_filesystem(module_name, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_storage(
     backend: Optional[config.STORAGE_BACKEND_TYPE] = None, *args, **kwargs
 ) -> Union[
-    S3FileSystem, GCSFileSystem, OCIFileSystem, AzureBlobFileSystem, LocalFileSystem
+    "S3FileSystem",
+    "GCSFileSystem",
+    "OCIFileSystem",
+    "AzureBlobFileSystem",
+    LocalFileSystem,
 ]:
     """
     Creates a storage filesystem instance based on the specified or default backend.
+    Only the package of the requested backend is imported.
 
     :param backend: The storage backend to use
     :param args: Additional positional arguments to be passed
@@ -66,14 +71,8 @@ def create_storage(
     for key, value in backend_kwargs.items():
         kwargs.setdefault(key, value)
     try:
-        if backend == config.STORAGE_BACKEND_AWS:
-            return S3FileSystem(*args, **kwargs)
-        elif backend == config.STORAGE_BACKEND_GCP:
-            return GCSFileSystem(*args, **kwargs)
-        elif backend == config.STORAGE_BACKEND_OCI:
-            return OCIFileSystem(*args, **kwargs)
-        elif backend == config.STORAGE_BACKEND_AZURE:
-            return AzureBlobFileSystem(*args, **kwargs)
+        if backend in _CLOUD_FILESYSTEMS:
+            return _import_filesystem(*_CLOUD_FILESYSTEMS[backend])(*args, **kwargs)
         elif backend == config.STORAGE_BACKEND_LOCAL:
             return LocalFileSystem(*args, **kwargs)
     except Exception as e:
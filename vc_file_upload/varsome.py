@@ -1,24 +1,82 @@
 import contextlib
 import dataclasses
+import functools
 import hashlib
-import io
-import pathlib
+import os
+import random
 import threading
-from queue import Queue
-from typing import Dict, Iterator, Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
 import requests
 
 from vc_file_upload.exception import UploadException
-from vc_file_upload.http_request import http_session
+from vc_file_upload.http_request import DEFAULT_TIMEOUT, http_session
 from vc_file_upload.logging_config import get_library_logger
 
 logger = get_library_logger()
 
 DEFAULT_BASE_URL = "https://ch.clinical.varsome.com"
 MAX_SINGLE_UPLOAD_BYTES = 100 * 1024 * 1024
+# Chunk throughput drops sharply below ~16 MiB since every chunk pays a full
+# request round trip. Each upload in flight buffers the current and the next
+# chunk, so memory use grows with both this value and MAX_PARALLEL_TRANSFERS.
 MULTIPART_CHUNK_BYTES = 20 * 1024 * 1024
+MAX_PARALLEL_TRANSFERS = 8
+MAX_PARALLEL_RETRIEVALS = 32
+# Single uploads and multipart completions wait for the server to store and
+# checksum the whole file, which can take longer than the default read timeout.
+# Only the connection attempt of these requests is bounded.
+PROCESSING_TIMEOUT = (DEFAULT_TIMEOUT[0], None)
+# Connection errors and timeouts while sending a chunk are retried with
+# exponential backoff, on top of the status retries done by the HTTP session.
+# Re-sending a chunk that the server already stored is answered with 416 and
+# the server's offset, which the upload loop resumes from. The first chunk has
+# no upload ID yet, so if its response is lost the retry starts a new upload on
+# the server and the first one is left incomplete.
+CHUNK_UPLOAD_RETRIES = 3
+CHUNK_RETRY_MAX_BACKOFF = 30.0
+
+
+@functools.lru_cache(maxsize=32)
+def _join_url(base_url: str, url: str) -> str:
+    """
+    Cached ``urljoin``. Only a handful of endpoints are used, but they are joined
+    once per request, including every chunk of a multipart upload.
+    """
+    return urljoin(base_url, url)
+
+
+def _file_items(
+    files: Union[Mapping[str, str], Iterable[Tuple[str, str]]],
+) -> Iterable[Tuple[str, str]]:
+    """
+    Returns the (key, file name) pairs of ``files``, which is either a mapping or
+    an already paired, possibly lazy, iterable.
+    """
+    return files.items() if isinstance(files, Mapping) else files
+
+
+def _is_transient_error(error: requests.exceptions.RequestException) -> bool:
+    """
+    Returns whether a request error is worth retrying: connection errors and
+    timeouts, but not TLS errors, which do not go away by retrying.
+    """
+    return isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ) and not isinstance(error, requests.exceptions.SSLError)
 
 
 @dataclasses.dataclass(kw_only=True)
@@ -33,19 +91,43 @@ class VarSomeClinicalFileUploader:
     :ivar clinical_base_url: The base URL for the clinical API. Defaults to
         "https://ch.clinical.varsome.com".
     :type clinical_base_url: str
+    :ivar max_parallel_transfers: The maximum number of local files that are
+        uploaded concurrently. Defaults to 8.
+    :type max_parallel_transfers: int
+    :ivar max_parallel_retrievals: The maximum number of external file retrieval
+        requests sent concurrently. These requests carry no file data, so
+        more of them can be in flight. Defaults to 32.
+    :type max_parallel_retrievals: int
     """
 
     clinical_api_token: str
     clinical_base_url: str = DEFAULT_BASE_URL
     max_single_file_upload_size_bytes: int = MAX_SINGLE_UPLOAD_BYTES
     multipart_upload_chunk_size: int = MULTIPART_CHUNK_BYTES
+    max_parallel_transfers: int = MAX_PARALLEL_TRANSFERS
+    max_parallel_retrievals: int = MAX_PARALLEL_RETRIEVALS
+
+    def __post_init__(self):
+        for field_name in (
+            "max_single_file_upload_size_bytes",
+            "multipart_upload_chunk_size",
+            "max_parallel_transfers",
+            "max_parallel_retrievals",
+        ):
+            if getattr(self, field_name) < 1:
+                raise ValueError(f"{field_name} must be a positive integer")
 
     @contextlib.contextmanager
     def _http_client_session(self):
         """
         Context manager to create and manage the HTTP client session.
+        The connection pool is sized so that every concurrent transfer
+        can keep its connection alive.
         """
-        client = http_session(self.clinical_api_token)
+        client = http_session(
+            self.clinical_api_token,
+            pool_maxsize=max(self.max_parallel_transfers, self.max_parallel_retrievals),
+        )
         try:
             yield client
         finally:
@@ -59,23 +141,55 @@ class VarSomeClinicalFileUploader:
         :type url: str
         :return: The full URL with the base URL appended.
         """
-        return urljoin(self.clinical_base_url, url)
+        return _join_url(self.clinical_base_url, url)
+
+    @staticmethod
+    def _run_concurrently(
+        func: Callable[..., Optional[Dict]], calls: Iterable[Tuple], max_workers: int
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Runs ``func`` for every argument tuple in ``calls`` using a bounded
+        thread pool. At most ``max_workers`` calls are in flight at
+        any time, so ``calls`` may be a lazy generator.
+
+        :param func: The callable to execute for every argument tuple.
+        :param calls: An iterable of argument tuples. The first argument of
+            each tuple is used as the key of the returned dictionary.
+        :param max_workers: The maximum number of concurrent calls.
+        :return: A dictionary mapping the first argument of each call to
+            its result, in the order the calls were submitted.
+        """
+        slots = threading.BoundedSemaphore(max_workers)
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for args in calls:
+                slots.acquire()
+                future = pool.submit(func, *args)
+                future.add_done_callback(lambda _: slots.release())
+                futures[args[0]] = future
+        return {key: future.result() for key, future in futures.items()}
 
     def retrieve_external_files(
-        self, files: Dict[str, str]
+        self, files: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
     ) -> Dict[str, Optional[Dict]]:
         """
         Retrieve multiple external files from the clinical API.
+        Requests are sent concurrently, up to ``max_parallel_retrievals`` at a time.
 
-        :param files: A dictionary where keys are file URLs and values are file names.
-        :type files: Dict[str, str]
+        :param files: A dictionary where keys are file URLs and values are file names,
+            or an iterable of (file URL, file name) tuples.
+        :type files: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
         :return: A dictionary containing metadata for each retrieved file (if any).
         """
         with self._http_client_session() as client:
-            return {
-                file_url: self._retrieve_external_file(file_url, file_name, client)
-                for file_url, file_name in files.items()
-            }
+            return self._run_concurrently(
+                self._retrieve_external_file,
+                (
+                    (file_url, file_name, client)
+                    for file_url, file_name in _file_items(files)
+                ),
+                self.max_parallel_retrievals,
+            )
 
     def _retrieve_external_file(
         self, file_url: str, file_name: str, client: requests.Session
@@ -110,41 +224,48 @@ class VarSomeClinicalFileUploader:
             )
         return None
 
-    def upload_local_files(self, files: Dict[str, str]) -> Dict[str, Optional[Dict]]:
+    def upload_local_files(
+        self, files: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+    ) -> Dict[str, Optional[Dict]]:
         """
         Upload multiple local files to the clinical API.
         Depending on the file size, it chooses between full and multipart upload.
-        :param files: A dictionary where keys are file paths and values are file names.
-        :type files: Dict[str, str]
+        Files are uploaded concurrently, up to ``max_parallel_transfers`` at a time.
+        :param files: A dictionary where keys are file paths and values are file names,
+            or an iterable of (file path, file name) tuples.
+        :type files: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
         :return: A dictionary containing metadata for each uploaded file.
         """
         with self._http_client_session() as client:
-            return {
-                file_path: self._upload_file_with_strategy(
-                    file_path, file_name, file_size, client
-                )
-                for file_path, file_name, file_size in self._files_with_sizes(files)
-            }
+            return self._run_concurrently(
+                self._upload_file_with_strategy,
+                (
+                    (file_path, file_name, file_size, client)
+                    for file_path, file_name, file_size in self._files_with_sizes(files)
+                ),
+                self.max_parallel_transfers,
+            )
 
     @staticmethod
     def _files_with_sizes(
-        files: Dict[str, str],
+        files: Union[Mapping[str, str], Iterable[Tuple[str, str]]],
     ) -> Iterator[Tuple[str, str, Optional[int]]]:
         """
         Calculate and yield the size of files along with their paths and names.
 
         :param files: A dictionary where the key is the file path
             as a string and the value
-            is the file name as a string.
-        :type files: Dict[str, str]
+            is the file name as a string, or an iterable of
+            (file path, file name) tuples.
+        :type files: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
 
         :return: A generator that yields tuples in the
             format (file_path, file_name, file_size).
         :rtype: Iterator[Tuple[str, str, Optional[int]]]
         """
-        for file_path, file_name in files.items():
+        for file_path, file_name in _file_items(files):
             try:
-                file_size = pathlib.Path(file_path).stat().st_size
+                file_size = os.stat(file_path).st_size
                 yield file_path, file_name, file_size
             except (IOError, OSError) as e:
                 logger.exception(
@@ -208,7 +329,12 @@ class VarSomeClinicalFileUploader:
         logger.info("Uploading local file %s from path %s", file_name, file_path)
         try:
             with open(file_path, "rb") as file:
-                response = client.put(api_url, data=file, headers=extra_headers)
+                response = client.put(
+                    api_url,
+                    data=file,
+                    headers=extra_headers,
+                    timeout=PROCESSING_TIMEOUT,
+                )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -237,9 +363,9 @@ class VarSomeClinicalFileUploader:
         self, file_path: str, file_name: str, file_size: int, client: requests.Session
     ) -> Optional[Dict]:
         """
-        Uploads a file to a remote server using a multipart upload. Calculates the MD5
-        checksum in a separate thread while starting the multipart upload process.
-        integrity.
+        Uploads a file to a remote server using a multipart upload. The MD5
+        checksum is calculated from the chunks as they are uploaded, so the file
+        is read only once.
 
         :param file_path: The path to the local file to be uploaded.
         :param file_name: The name to assign to the uploaded file.
@@ -247,29 +373,11 @@ class VarSomeClinicalFileUploader:
         :param client: The HTTP client session to use for the upload.
         :return: A dictionary containing the result of the multipart upload operation.
         :rtype: Dict
-        :raises Exception: If the MD5 checksum calculation fails or
-            any part of the multipart upload process encounters an error.
         """
-        queue = Queue()
-        md5_sum_thread = threading.Thread(
-            target=self._calculate_file_md5, args=(file_path, queue)
-        )
-        md5_sum_thread.start()
+        md5_hash = hashlib.md5()
         upload_id = self._process_multi_part_upload(
-            file_path, file_name, file_size, client
+            file_path, file_name, file_size, client, checksum=md5_hash
         )
-        md5_sum_thread.join()
-        md5_sum = queue.get()
-        if isinstance(md5_sum, Exception):
-            logger.exception(
-                "Failed to calculate file MD5",
-                extra={
-                    "file_path": file_path,
-                    "file_name": file_name,
-                    "error": str(md5_sum),
-                },
-            )
-            return None
         if upload_id is None:
             logger.error(
                 "Multipart upload failed: No upload ID returned",
@@ -279,15 +387,30 @@ class VarSomeClinicalFileUploader:
                 },
             )
             return None
-        return self._complete_multipart_upload(upload_id, md5_sum, client)
+        result = self._complete_multipart_upload(
+            upload_id, md5_hash.hexdigest(), client
+        )
+        if result is not None:
+            logger.info("Uploaded file %s (%d bytes)", file_name, file_size)
+        return result
 
     def _process_multi_part_upload(
-        self, file_path: str, file_name: str, file_size: int, client: requests.Session
+        self,
+        file_path: str,
+        file_name: str,
+        file_size: int,
+        client: requests.Session,
+        checksum: Optional["hashlib._Hash"] = None,
     ) -> Optional[str]:
         """
         Processes and uploads a file in chunks using multipart upload. Reads
         the file in specified chunk sizes, uploads each chunk sequentially, and retries
-        if specific exceptions are encountered.
+        if specific exceptions are encountered. The next chunk is read from disk in a
+        background thread while the current one is being uploaded, and the kernel is
+        advised to read ahead sequentially where supported. Chunks are read
+        into two buffers that are allocated once and alternate between the chunk
+        being uploaded and the one being read. The checksum is updated by the reader
+        right after each read, while the chunk is still in the CPU caches.
 
         :param file_path: Path to the file being uploaded.
         :type file_path: str
@@ -298,21 +421,56 @@ class VarSomeClinicalFileUploader:
         :param client: HTTP client session to be used for the upload
             (e.g., requests.Session).
         :type client: requests.Session
+        :param checksum: Optional hash object updated with the file contents, in
+            order, as the chunks are read. Bytes that are re-read after a
+            416 response are only hashed once.
+        :type checksum: Optional[hashlib._Hash]
         :return: Upload ID for the successfully uploaded multipart file.
         :rtype: str
         """
         start = 0
+        hashed_until = 0
         upload_id = None
         chunk_size = self.multipart_upload_chunk_size
+
+        def read_chunk(chunk_start: int, buffer: bytearray) -> memoryview:
+            # Only called on the single reader worker, so hashed_until and the
+            # checksum are never updated concurrently. The server can only rewind
+            # to an offset it has already received, and chunks are read
+            # contiguously otherwise, so chunk_start never lies beyond hashed_until.
+            nonlocal hashed_until
+            chunk = self._read_chunk(file, chunk_start, buffer)
+            chunk_end = chunk_start + len(chunk)
+            if checksum is not None and chunk_start <= hashed_until < chunk_end:
+                unhashed = hashed_until - chunk_start
+                checksum.update(chunk[unhashed:])
+                hashed_until = chunk_end
+            return chunk
+
         logger.info(
             "Starting multipart upload for file %s from path %s", file_name, file_path
         )
         try:
-            with open(file_path, "rb") as file:
+            with (
+                open(file_path, "rb") as file,
+                ThreadPoolExecutor(max_workers=1) as reader,
+            ):
+                if hasattr(os, "posix_fadvise"):
+                    # Chunks are read in order, so let the kernel read ahead of them.
+                    # This is only a hint, so a failure must not abort the upload.
+                    with contextlib.suppress(OSError):
+                        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                buffers = (
+                    bytearray(min(chunk_size, file_size)),
+                    bytearray(min(chunk_size, file_size)),
+                )
+                next_chunk = reader.submit(read_chunk, start, buffers[0])
                 while True:
                     end = min(start + chunk_size, file_size)
-                    file.seek(start)
-                    chunk = file.read(chunk_size)
+                    chunk = next_chunk.result()
+                    spare_buffer = buffers[chunk.obj is buffers[0]]
+                    if end < file_size:
+                        next_chunk = reader.submit(read_chunk, end, spare_buffer)
                     try:
                         upload_id = self._upload_chunk(
                             file_name,
@@ -327,8 +485,16 @@ class VarSomeClinicalFileUploader:
                     except UploadException as e:
                         if e.status_code == 416:
                             response = e.original_exception.response
-                            if server_offset := response.json().get("offset"):
+                            server_offset = response.json().get("offset")
+                            if server_offset and server_offset >= file_size:
+                                # The server already has the whole file, e.g. the
+                                # response to the last chunk was lost and the
+                                # chunk was re-sent.
+                                return upload_id
+                            if server_offset:
+                                # The failed chunk's buffer is free again.
                                 start = server_offset
+                                next_chunk = reader.submit(read_chunk, start, chunk.obj)
                                 continue
                         logger.exception(
                             "Failed to upload local file",
@@ -350,10 +516,25 @@ class VarSomeClinicalFileUploader:
             )
             return None
 
+    @staticmethod
+    def _read_chunk(file: BinaryIO, start: int, buffer: bytearray) -> memoryview:
+        """
+        Reads up to ``len(buffer)`` bytes of ``file`` starting at offset ``start``
+        into ``buffer``, without allocating a new bytes object. Reads are submitted
+        to a single worker, so the shared file position is never moved concurrently.
+
+        :param file: The file object opened in binary mode.
+        :param start: The offset to start reading from.
+        :param buffer: The preallocated buffer to read into.
+        :return: A view of the bytes read into the buffer.
+        """
+        file.seek(start)
+        return memoryview(buffer)[: file.readinto(buffer)]
+
     def _upload_chunk(
         self,
         file_name: str,
-        chunk: bytes,
+        chunk: Union[bytes, memoryview],
         client: requests.Session,
         file_range: str,
         upload_id: Optional[str] = None,
@@ -364,8 +545,10 @@ class VarSomeClinicalFileUploader:
         :param file_name: Name of the file being uploaded.
         :type file_name: str
         :param chunk: The binary data representing the chunk of the file
-            to be uploaded.
-        :type chunk: bytes
+            to be uploaded. It is copied into the encoded multipart body of
+            each request, so a memoryview saves allocations when reading, not
+            when sending.
+        :type chunk: Union[bytes, memoryview]
         :param client: An HTTP session client to use for sending requests.
         :type client: requests.Session
         :param file_range: Specifies the byte range of the chunk in the format
@@ -380,32 +563,41 @@ class VarSomeClinicalFileUploader:
             or response issue, such as network errors or malformed server responses.
         """
         api_url = self._api_url("/sample-files/filestore-upload/add/")
-        extra_headers = {
-            "Content-Range": f"bytes {file_range}",
-        }
-        logger.info("Uploading chunk %s for file %s", file_range, file_name)
-        try:
-            form_data = {
-                "data-file": (file_name, io.BytesIO(chunk), "application/octet-stream"),
-            }
-            request_params = {}
-            if upload_id:
-                request_params["upload_id"] = upload_id
-            response = client.post(
-                api_url, files=form_data, headers=extra_headers, params=request_params
-            )
-            logger.info("Chunk upload response status: %s", response.status_code)
-            response.raise_for_status()
-            return response.json()["upload_id"]
-        except requests.exceptions.RequestException as e:
-            raise UploadException(
-                f"Failed to upload file {file_name}", original_exception=e
-            ) from e
-        except KeyError as e:
-            raise UploadException(
-                f"Invalid response while uploading file {file_name}",
-                original_exception=e,
-            ) from e
+        for attempt in range(CHUNK_UPLOAD_RETRIES + 1):
+            logger.debug("Uploading chunk %s for file %s", file_range, file_name)
+            try:
+                # The request dicts are built per call on purpose: chunks of different
+                # files are uploaded concurrently, so shared mutable dicts would race.
+                response = client.post(
+                    api_url,
+                    files={"data-file": (file_name, chunk, "application/octet-stream")},
+                    headers={"Content-Range": f"bytes {file_range}"},
+                    params={"upload_id": upload_id} if upload_id else {},
+                )
+                logger.debug("Chunk upload response status: %s", response.status_code)
+                response.raise_for_status()
+                return response.json()["upload_id"]
+            except requests.exceptions.RequestException as e:
+                if attempt < CHUNK_UPLOAD_RETRIES and _is_transient_error(e):
+                    delay = min(CHUNK_RETRY_MAX_BACKOFF, 0.5 * 2**attempt)
+                    delay += random.uniform(0, 0.5)
+                    logger.warning(
+                        "Retrying chunk %s for file %s in %.1f seconds",
+                        file_range,
+                        file_name,
+                        delay,
+                        extra={"error": str(e)},
+                    )
+                    time.sleep(delay)
+                    continue
+                raise UploadException(
+                    f"Failed to upload file {file_name}", original_exception=e
+                ) from e
+            except KeyError as e:
+                raise UploadException(
+                    f"Invalid response while uploading file {file_name}",
+                    original_exception=e,
+                ) from e
 
     def _complete_multipart_upload(
         self, upload_id: str, md5_sum, client: requests.Session
@@ -427,7 +619,9 @@ class VarSomeClinicalFileUploader:
         logger.info("Completing multipart upload with ID %s", upload_id)
         try:
             response = client.post(
-                api_url, data={"upload_id": upload_id, "md5": md5_sum}
+                api_url,
+                data={"upload_id": upload_id, "md5": md5_sum},
+                timeout=PROCESSING_TIMEOUT,
             )
             response.raise_for_status()
             return response.json()
@@ -442,25 +636,3 @@ class VarSomeClinicalFileUploader:
                 },
             )
         return None
-
-    @staticmethod
-    def _calculate_file_md5(file_path: str, queue: Queue):
-        """
-        Calculate the MD5 hash of a file over using a thread
-        and places the result into a provided queue.
-        :param file_path: The path to the file whose MD5 hash is to be calculated.
-        :type file_path: str
-        :param queue: A queue where the resulting MD5 hash or
-            an exception will be placed.
-        :type queue: Queue
-        :return: None
-        """
-        md5_hash = hashlib.md5()
-        logger.info("Calculating MD5 hash for file %s", file_path)
-        try:
-            with open(file_path, "rb") as f:
-                while chunk := f.read(8192):
-                    md5_hash.update(chunk)
-            queue.put(md5_hash.hexdigest())
-        except (OSError, IOError) as e:
-            queue.put(e)